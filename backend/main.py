@@ -3,6 +3,7 @@
 import logging
 from contextlib import asynccontextmanager
 
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -10,6 +11,7 @@ from fastapi.responses import HTMLResponse
 
 import config
 from backend.routes import router
+from backend.utils.inference import get_pipeline
 
 # Configure logging
 logging.basicConfig(
@@ -18,12 +20,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Under `gunicorn --preload` the module is imported once in the master process,
+# so loading here lets forked workers share the weights copy-on-write. The
+# pipeline's worker threads do not survive fork; each worker starts its own on
+# first use. CUDA cannot be initialised before fork, so GPU workers load in the
+# lifespan instead.
+if config.PRELOAD_MODEL and config.DEVICE == "cpu":
+    get_pipeline()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for app startup and shutdown."""
     logger.info("Starting Virtual Try-On AI application")
     # Startup
+    to_thread.current_default_thread_limiter().total_tokens = config.API_THREADPOOL_SIZE
+    if config.PRELOAD_MODEL:
+        # Load models before accepting traffic so the first request is not cold
+        app.state.pipeline = get_pipeline()
     yield
     # Shutdown
     logger.info("Shutting down Virtual Try-On AI application")
@@ -81,6 +95,12 @@ async def root():
                 <code>Expected: person_image (file), garment_image (file), garment_type (optional)</code>
             </div>
             
+            <div class="endpoint">
+                <strong>POST /api/virtual-tryon-binary</strong><br>
+                Same as the upload endpoint, but returns the result as raw JPEG bytes<br>
+                <code>Expected: person_image (file), garment_image (file), garment_type (optional)</code>
+            </div>
+            
             <div class="endpoint">
                 <strong>POST /api/classify-garment</strong><br>
                 Classify clothing type from an image<br>
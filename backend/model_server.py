@@ -0,0 +1,112 @@
+"""Standalone model server sharing one inference pipeline between frontend processes."""
+
+import logging
+import os
+import secrets
+import socket
+from multiprocessing.managers import BaseManager
+
+from backend.utils.inference import get_pipeline
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Pipeline methods callable through the server; images are pickled across the socket
+EXPOSED_METHODS = ("generate_try_on", "generate_try_on_batched", "classify_garment", "clear_cache")
+
+
+class ModelServer(BaseManager):
+    """Manager serving the inference pipeline over a local socket."""
+
+
+def get_authkey(create: bool = False) -> bytes:
+    """
+    Get the shared secret authenticating model server connections.
+
+    The manager protocol unpickles what arrives on the socket, so there is no
+    default key: it comes from MODEL_SERVER_AUTHKEY or an owner-only key file.
+
+    Args:
+        create: Generate the key file if it does not exist yet (server side)
+
+    Returns:
+        Authentication key
+    """
+    if config.MODEL_SERVER_AUTHKEY:
+        return config.MODEL_SERVER_AUTHKEY.encode()
+
+    path = config.MODEL_SERVER_AUTHKEY_FILE
+    if create:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, "w") as key_file:
+                key_file.write(secrets.token_hex(32))
+
+    try:
+        with open(path) as key_file:
+            return key_file.read().strip().encode()
+    except FileNotFoundError:
+        raise RuntimeError(
+            f"No model server key at {path}; start the model server first "
+            "or set MODEL_SERVER_AUTHKEY"
+        )
+
+
+def _remove_stale_socket(address: str):
+    """Remove a socket file left by a dead server, refusing if one still listens."""
+    if not os.path.exists(address):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(address)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(address)
+            return
+    raise RuntimeError(f"A model server is already listening on {address}")
+
+
+def serve(address: str = config.MODEL_SERVER_ADDRESS):
+    """
+    Load the pipeline and serve it until interrupted.
+
+    Args:
+        address: Unix socket path to listen on
+    """
+    _remove_stale_socket(address)
+    authkey = get_authkey(create=True)
+    pipeline = get_pipeline()
+
+    ModelServer.register("get_pipeline", callable=lambda: pipeline, exposed=EXPOSED_METHODS)
+    manager = ModelServer(address=address, authkey=authkey)
+    server = manager.get_server()
+    logger.info(f"Model server listening on {address}")
+    server.serve_forever()
+
+
+def connect_pipeline(address: str = config.MODEL_SERVER_ADDRESS):
+    """
+    Connect to a running model server.
+
+    Args:
+        address: Unix socket path the server listens on
+
+    Returns:
+        Proxy exposing the pipeline's try-on and classification methods
+    """
+    ModelServer.register("get_pipeline", exposed=EXPOSED_METHODS)
+    manager = ModelServer(address=address, authkey=get_authkey())
+    manager.connect()
+    logger.info(f"Connected to model server at {address}")
+    return manager.get_pipeline()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    serve()
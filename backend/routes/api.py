@@ -3,16 +3,37 @@
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, File, Form, UploadFile, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, File, Form, UploadFile, HTTPException, Request, Response
+from PIL import Image
+from pydantic import BaseModel, Field
 
+import config
+from backend.utils.cache import LRUCache, content_key
 from backend.utils.image_processor import ImageProcessor
-from backend.utils.inference import get_pipeline
+from backend.utils.inference import InferencePipeline, get_pipeline
 
 logger = logging.getLogger(__name__)
 
+# Handlers doing CPU/GPU work are plain functions so FastAPI runs them in its
+# threadpool instead of blocking the event loop
 router = APIRouter(prefix="/api", tags=["virtual-try-on"])
 processor = ImageProcessor()
+# Keyed on the raw base64 payloads so repeated requests skip decoding entirely
+response_cache = LRUCache(config.RESULT_CACHE_SIZE)
+
+
+def get_app_pipeline(request: Request) -> InferencePipeline:
+    """Return the pipeline loaded in the app lifespan, loading it on first use if needed."""
+    pipeline = getattr(request.app.state, "pipeline", None)
+    if pipeline is None:
+        pipeline = request.app.state.pipeline = get_pipeline()
+    return pipeline
+
+
+def _decode_upload(upload: UploadFile) -> Image.Image:
+    """Decode an uploaded image straight from its spooled file."""
+    upload.file.seek(0)
+    return Image.open(upload.file).convert("RGB")
 
 
 class GarmentClassificationRequest(BaseModel):
@@ -35,6 +56,7 @@ class VirtualTryOnRequest(BaseModel):
     person_image_base64: str
     garment_image_base64: str
     garment_type: Optional[str] = None
+    num_inference_steps: int = Field(config.NUM_INFERENCE_STEPS, ge=1, le=100)
 
 
 class VirtualTryOnResponse(BaseModel):
@@ -47,19 +69,21 @@ class VirtualTryOnResponse(BaseModel):
 
 
 @router.post("/classify-garment", response_model=GarmentClassificationResponse)
-async def classify_garment(request: GarmentClassificationRequest):
+def classify_garment(
+    request: GarmentClassificationRequest,
+    pipeline: InferencePipeline = Depends(get_app_pipeline),
+):
     """
     Classify clothing type from an image.
 
     Args:
         request: Base64 encoded image
+        pipeline: Inference pipeline from the app state
 
     Returns:
         Classification results
     """
     try:
-        pipeline = get_pipeline()
-
         # Decode base64 image
         image = processor.base64_to_image(request.image_base64)
 
@@ -78,18 +102,30 @@ async def classify_garment(request: GarmentClassificationRequest):
 
 
 @router.post("/virtual-tryon", response_model=VirtualTryOnResponse)
-async def virtual_tryon(request: VirtualTryOnRequest):
+def virtual_tryon(
+    request: VirtualTryOnRequest,
+    pipeline: InferencePipeline = Depends(get_app_pipeline),
+):
     """
     Generate virtual try-on result.
 
     Args:
         request: Images and optional garment type
+        pipeline: Inference pipeline from the app state
 
     Returns:
         Try-on result with generated image
     """
     try:
-        pipeline = get_pipeline()
+        cache_key = content_key(
+            request.person_image_base64,
+            request.garment_image_base64,
+            request.garment_type,
+            request.num_inference_steps,
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Decode base64 images
         person_image = processor.base64_to_image(request.person_image_base64)
@@ -100,17 +136,20 @@ async def virtual_tryon(request: VirtualTryOnRequest):
             person_image=person_image,
             garment_image=garment_image,
             garment_type=request.garment_type,
+            num_inference_steps=request.num_inference_steps,
         )
 
         # Encode result image to base64
         result_base64 = processor.image_to_base64(result["result_image"])
 
-        return VirtualTryOnResponse(
+        response = VirtualTryOnResponse(
             result_image_base64=result_base64,
             garment_detected=result["garment_detected"],
             confidence=result["confidence"],
             processing_time=result["processing_time"],
         )
+        response_cache.put(cache_key, response)
+        return response
 
     except Exception as e:
         logger.error(f"Error in virtual try-on: {e}")
@@ -118,10 +157,11 @@ async def virtual_tryon(request: VirtualTryOnRequest):
 
 
 @router.post("/virtual-tryon-upload")
-async def virtual_tryon_upload(
+def virtual_tryon_upload(
     person_image: UploadFile = File(...),
     garment_image: UploadFile = File(...),
     garment_type: Optional[str] = Form(None),
+    pipeline: InferencePipeline = Depends(get_app_pipeline),
 ):
     """
     Generate virtual try-on with file uploads.
@@ -130,23 +170,15 @@ async def virtual_tryon_upload(
         person_image: Uploaded person image
         garment_image: Uploaded garment image
         garment_type: Optional garment type
+        pipeline: Inference pipeline from the app state
 
     Returns:
         Try-on result
     """
     try:
-        from PIL import Image
-        from io import BytesIO
-
-        pipeline = get_pipeline()
-
-        # Read uploaded files
-        person_image_data = await person_image.read()
-        garment_image_data = await garment_image.read()
-
-        # Convert to PIL Images
-        person_pil = Image.open(BytesIO(person_image_data)).convert("RGB")
-        garment_pil = Image.open(BytesIO(garment_image_data)).convert("RGB")
+        # Decode uploaded files
+        person_pil = _decode_upload(person_image)
+        garment_pil = _decode_upload(garment_image)
 
         # Generate try-on
         result = pipeline.generate_try_on(
@@ -170,6 +202,63 @@ async def virtual_tryon_upload(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/virtual-tryon-binary")
+def virtual_tryon_binary(
+    person_image: UploadFile = File(...),
+    garment_image: UploadFile = File(...),
+    garment_type: Optional[str] = Form(None),
+    pipeline: InferencePipeline = Depends(get_app_pipeline),
+):
+    """
+    Generate virtual try-on with file uploads, returning the raw JPEG.
+
+    Skips base64 encoding of the result; metadata is sent in X-* headers.
+
+    Args:
+        person_image: Uploaded person image
+        garment_image: Uploaded garment image
+        garment_type: Optional garment type
+        pipeline: Inference pipeline from the app state
+
+    Returns:
+        JPEG image response
+    """
+    # The garment type is echoed in a header, so only known (latin-1 safe) values are accepted
+    if garment_type is not None:
+        garment_type = garment_type.lower()
+    if garment_type is not None and garment_type not in config.GARMENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown garment_type, expected one of: {', '.join(config.GARMENT_TYPES)}",
+        )
+
+    try:
+        # Decode uploaded files
+        person_pil = _decode_upload(person_image)
+        garment_pil = _decode_upload(garment_image)
+
+        # Generate try-on
+        result = pipeline.generate_try_on(
+            person_image=person_pil,
+            garment_image=garment_pil,
+            garment_type=garment_type,
+        )
+
+        return Response(
+            content=processor.image_to_bytes(result["result_image"], format="JPEG"),
+            media_type="image/jpeg",
+            headers={
+                "X-Garment-Detected": result["garment_detected"],
+                "X-Confidence": f"{result['confidence']:.4f}",
+                "X-Processing-Time": f"{result['processing_time']:.3f}",
+            },
+        )
+
+    except Exception as e:
+        logger.error(f"Error in virtual try-on binary: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -177,10 +266,10 @@ async def health_check():
 
 
 @router.post("/clear-cache")
-async def clear_cache():
-    """Clear GPU/CPU cache."""
+def clear_cache(pipeline: InferencePipeline = Depends(get_app_pipeline)):
+    """Clear cached responses and GPU/CPU cache."""
     try:
-        pipeline = get_pipeline()
+        response_cache.clear()
         pipeline.clear_cache()
         return {"status": "success", "message": "Cache cleared"}
     except Exception as e:
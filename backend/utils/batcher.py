@@ -0,0 +1,76 @@
+"""Dynamic micro-batching of concurrent inference calls."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicBatcher:
+    """Group calls arriving close together into a single batched call."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        timeout_ms: float,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_fn: Function mapping a list of items to a list of results, in order
+            max_batch_size: Maximum number of items per batch
+            timeout_ms: How long to wait for more items after the first arrives
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="dynamic-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item and return a future for its result."""
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item: Any) -> Any:
+        """Queue an item and block until its result is ready."""
+        return self.submit(item).result()
+
+    def _collect(self) -> List[Tuple[Any, Future]]:
+        """Block for one item, then gather more until full or timed out."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.timeout
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Worker loop feeding batches to batch_fn."""
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            logger.debug(f"Dispatching batch of {len(items)}")
+            try:
+                results = self.batch_fn(items)
+            except Exception as e:
+                logger.error(f"Batched call failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
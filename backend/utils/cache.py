@@ -0,0 +1,134 @@
+"""Content-addressed caching for the try-on pipeline."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+from PIL import Image
+
+
+def content_key(*parts: Any) -> bytes:
+    """
+    Build a content hash from images, strings, bytes and scalars.
+
+    Args:
+        parts: Values that together identify a cacheable computation
+
+    Returns:
+        BLAKE2b digest of the parts
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        # Tag every part with its type and length so e.g. None and "None" differ
+        if isinstance(part, Image.Image):
+            header = f"image:{part.mode}:{part.size}"
+            data = part.tobytes()
+        elif isinstance(part, (bytes, bytearray, memoryview)):
+            header = "bytes"
+            data = part
+        elif isinstance(part, str):
+            header = "str"
+            data = part.encode()
+        else:
+            header = type(part).__name__
+            data = repr(part).encode()
+        digest.update(f"{header}:{memoryview(data).nbytes}:".encode())
+        digest.update(data)
+    return digest.digest()
+
+
+class LRUCache:
+    """Thread-safe in-memory least-recently-used cache."""
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskCache:
+    """Thread-safe least-recently-used cache of byte blobs stored as files."""
+
+    def __init__(self, directory: str, maxsize: int, suffix: str = ""):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding one file per entry
+            maxsize: Maximum number of entries (0 disables caching)
+            suffix: File extension for entries, e.g. ".jpg"
+        """
+        self.directory = Path(directory)
+        self.maxsize = maxsize
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        if maxsize > 0:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: bytes) -> Path:
+        return self.directory / f"{key.hex()}{self.suffix}"
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Return the cached bytes for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, key: bytes, data: bytes):
+        """Store bytes, evicting the least recently used entries if full."""
+        if self.maxsize <= 0:
+            return
+        path = self._path(key)
+        with self._lock:
+            # Write then rename so readers never see a partial file
+            tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+            entries = list(self.directory.glob(f"*{self.suffix}"))
+            if len(entries) > self.maxsize:
+                entries.sort(key=lambda entry: entry.stat().st_mtime)
+                for entry in entries[: len(entries) - self.maxsize]:
+                    entry.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob(f"*{self.suffix}"))
@@ -3,11 +3,12 @@
 import logging
 from io import BytesIO
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 import cv2
 import numpy as np
-from PIL import Image
+import pybase64
+from PIL import Image, ImageEnhance
 
 import config
 
@@ -38,38 +39,85 @@ class ImageProcessor:
 
     @staticmethod
     def resize_image(
-        image: Image.Image, max_size: Tuple[int, int] = config.MAX_IMAGE_SIZE
+        image: Image.Image,
+        max_size: Tuple[int, int] = config.MAX_IMAGE_SIZE,
+        high_quality: bool = False,
     ) -> Image.Image:
         """
         Resize image to fit within max_size while maintaining aspect ratio.
 
+        Images already within max_size are returned unchanged.
+
         Args:
             image: PIL Image object
             max_size: Maximum (width, height)
+            high_quality: Use PIL's LANCZOS filter instead of OpenCV's INTER_AREA
 
         Returns:
             Resized PIL Image object
         """
-        image.thumbnail(max_size, Image.Resampling.LANCZOS)
-        return image
+        width, height = image.size
+        if width <= max_size[0] and height <= max_size[1]:
+            return image
+
+        if high_quality or image.mode not in ("RGB", "RGBA", "L"):
+            image.thumbnail(max_size, Image.Resampling.LANCZOS)
+            return image
+
+        return Image.fromarray(ImageProcessor.resize_array(np.asarray(image), max_size))
 
     @staticmethod
-    def normalize_image(image: Image.Image) -> np.ndarray:
+    def resize_array(
+        image_array: np.ndarray, max_size: Tuple[int, int] = config.MAX_IMAGE_SIZE
+    ) -> np.ndarray:
+        """
+        Downscale an image array to fit within max_size using INTER_AREA.
+
+        Args:
+            image_array: Image as (H, W) or (H, W, C) numpy array
+            max_size: Maximum (width, height)
+
+        Returns:
+            Resized array, or the input itself if it already fits
+        """
+        height, width = image_array.shape[:2]
+        scale = min(max_size[0] / width, max_size[1] / height)
+        if scale >= 1:
+            return image_array
+
+        new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(image_array, new_size, interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def normalize_image(
+        image: Image.Image, channels_first: bool = False, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
         Convert PIL Image to normalized numpy array.
 
         Args:
             image: PIL Image object
+            channels_first: Return planar (C, H, W) data instead of (H, W, C)
+            out: Optional float32 buffer to write into, reused if its shape matches
 
         Returns:
-            Normalized numpy array (0-1 range, RGB)
+            Normalized float32 numpy array (0-1 range, RGB)
         """
-        image_array = np.array(image, dtype=np.float32) / 255.0
-        return image_array
+        image_array = np.asarray(image)
+        if channels_first:
+            image_array = image_array.transpose(2, 0, 1)
+
+        # Single pass: widen uint8 to float32 and scale straight into the output
+        if out is not None and out.shape == image_array.shape and out.dtype == np.float32:
+            normalized = out
+        else:
+            normalized = np.empty(image_array.shape, dtype=np.float32)
+        np.multiply(image_array, np.float32(1 / 255.0), out=normalized)
+        return normalized
 
     @staticmethod
     def denormalize_image(
-        image_array: np.ndarray, format: str = "PIL"
+        image_array: np.ndarray, format: str = "PIL", out: Optional[np.ndarray] = None
     ) -> Union[Image.Image, np.ndarray]:
         """
         Convert normalized numpy array back to image.
@@ -77,11 +125,20 @@ class ImageProcessor:
         Args:
             image_array: Normalized numpy array (0-1 range)
             format: Output format ('PIL' or 'numpy')
+            out: Optional uint8 buffer to write into, reused if its shape matches
 
         Returns:
             PIL Image or numpy array (0-255)
         """
-        image_array = np.clip(image_array * 255, 0, 255).astype(np.uint8)
+        # Scale and clip in one float32 temporary rather than float64 copies
+        scaled = np.multiply(image_array, np.float32(255), dtype=np.float32)
+        np.clip(scaled, 0, 255, out=scaled)
+
+        if out is not None and out.shape == scaled.shape and out.dtype == np.uint8:
+            np.copyto(out, scaled, casting="unsafe")
+            image_array = out
+        else:
+            image_array = scaled.astype(np.uint8)
 
         if format == "PIL":
             return Image.fromarray(image_array, mode="RGB")
@@ -126,22 +183,62 @@ class ImageProcessor:
         return padded
 
     @staticmethod
-    def image_to_base64(image: Image.Image) -> str:
+    def _encode_image(image: Image.Image, format: Optional[str], quality: int) -> BytesIO:
+        """Encode an image into an in-memory buffer (JPEG unless alpha or format say otherwise)."""
+        if format is None:
+            format = "PNG" if "A" in image.getbands() else "JPEG"
+
+        buffer = BytesIO()
+        if format.upper() in ("JPEG", "JPG"):
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            image.save(
+                buffer,
+                format="JPEG",
+                quality=quality,
+                optimize=False,
+                progressive=False,
+                subsampling=2,  # 4:2:0 chroma
+            )
+        else:
+            image.save(buffer, format=format)
+        return buffer
+
+    @staticmethod
+    def image_to_bytes(
+        image: Image.Image, format: Optional[str] = None, quality: int = config.IMAGE_QUALITY
+    ) -> bytes:
+        """
+        Encode PIL Image to compressed image bytes.
+
+        Args:
+            image: PIL Image object
+            format: Encoding format; defaults to JPEG, or PNG when the image has alpha
+            quality: JPEG quality (1-100)
+
+        Returns:
+            Encoded image bytes
+        """
+        return ImageProcessor._encode_image(image, format, quality).getvalue()
+
+    @staticmethod
+    def image_to_base64(
+        image: Image.Image, format: Optional[str] = None, quality: int = config.IMAGE_QUALITY
+    ) -> str:
         """
         Convert PIL Image to base64 string.
 
         Args:
             image: PIL Image object
+            format: Encoding format; defaults to JPEG, or PNG when the image has alpha
+            quality: JPEG quality (1-100)
 
         Returns:
             Base64 encoded string
         """
-        import base64
-
-        buffer = BytesIO()
-        image.save(buffer, format="PNG")
-        buffer.seek(0)
-        return base64.b64encode(buffer.getvalue()).decode()
+        # Encode straight from the buffer's memory, skipping the getvalue() copy
+        buffer = ImageProcessor._encode_image(image, format, quality)
+        return pybase64.b64encode(buffer.getbuffer()).decode("ascii")
 
     @staticmethod
     def base64_to_image(base64_string: str) -> Image.Image:
@@ -154,9 +251,7 @@ class ImageProcessor:
         Returns:
             PIL Image object
         """
-        import base64
-
-        image_data = base64.b64decode(base64_string)
+        image_data = pybase64.b64decode(base64_string, validate=False)
         return Image.open(BytesIO(image_data)).convert("RGB")
 
     @staticmethod
@@ -187,16 +282,12 @@ class ImageProcessor:
     @staticmethod
     def enhance_contrast(image: Image.Image, factor: float = 1.2) -> Image.Image:
         """Enhance image contrast."""
-        from PIL import ImageEnhance
-
         enhancer = ImageEnhance.Contrast(image)
         return enhancer.enhance(factor)
 
     @staticmethod
     def enhance_brightness(image: Image.Image, factor: float = 1.1) -> Image.Image:
         """Enhance image brightness."""
-        from PIL import ImageEnhance
-
         enhancer = ImageEnhance.Brightness(image)
         return enhancer.enhance(factor)
 
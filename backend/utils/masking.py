@@ -1,7 +1,8 @@
 """Semantic masking for intelligent garment placement."""
 
+import functools
 import logging
-from typing import Tuple
+from typing import Optional, Tuple, Union
 
 import cv2
 import numpy as np
@@ -12,23 +13,80 @@ import config
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=64)
+def _build_garment_mask(garment_type: str, height: int, width: int) -> np.ndarray:
+    """
+    Build the smoothed region mask for a garment type at a given resolution.
+
+    The result only depends on its arguments, so it is cached and returned
+    read-only; callers must copy before mutating.
+
+    Args:
+        garment_type: Lower-cased garment type
+        height: Image height
+        width: Image width
+
+    Returns:
+        Read-only mask for garment region
+    """
+    mask = np.zeros((height, width), dtype=np.uint8)
+
+    # Define regions for different garment types
+    garment_regions = {
+        "hat": (0, 0, width, int(height * 0.15)),
+        "glasses": (int(width * 0.25), int(height * 0.15), int(width * 0.75), int(height * 0.25)),
+        "shirt": (0, int(height * 0.15), width, int(height * 0.6)),
+        "t-shirt": (0, int(height * 0.15), width, int(height * 0.5)),
+        "blouse": (0, int(height * 0.15), width, int(height * 0.55)),
+        "dress": (0, int(height * 0.15), width, int(height * 0.85)),
+        "jacket": (0, int(height * 0.15), width, int(height * 0.65)),
+        "pants": (0, int(height * 0.45), width, int(height * 0.9)),
+        "jeans": (0, int(height * 0.45), width, int(height * 0.9)),
+        "skirt": (0, int(height * 0.4), width, int(height * 0.75)),
+        "shoes": (0, int(height * 0.85), width, height),
+        "scarf": (int(width * 0.2), int(height * 0.2), int(width * 0.8), int(height * 0.35)),
+    }
+
+    # Get region for garment type
+    region = garment_regions.get(garment_type, (0, 0, width, height))
+    x1, y1, x2, y2 = region
+
+    # Draw mask region
+    cv2.rectangle(mask, (x1, y1), (x2, y2), 255, -1)
+
+    # Apply dilation for smoothing
+    kernel = cv2.getStructuringElement(
+        cv2.MORPH_ELLIPSE, (config.MASK_DILATION_KERNEL, config.MASK_DILATION_KERNEL)
+    )
+    mask = cv2.dilate(mask, kernel, iterations=1)
+
+    # Apply Gaussian blur for smooth edges
+    mask = cv2.GaussianBlur(mask, config.MASK_BLUR_SIZE, 0)
+
+    mask.setflags(write=False)
+    return mask
+
+
 class SemanticMasker:
     """Generate semantic masks for garment placement."""
 
     @staticmethod
-    def create_body_mask(image: Image.Image) -> np.ndarray:
+    def create_body_mask(
+        image: Union[Image.Image, np.ndarray], out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
         Create a simple body mask using edge detection.
         This is a basic implementation; can be enhanced with ML models.
 
         Args:
-            image: PIL Image object
+            image: PIL Image or RGB uint8 numpy array
+            out: Optional buffer to write the mask into, reused if its shape matches
 
         Returns:
             Binary mask (0 or 255) as numpy array
         """
         # Convert to grayscale
-        image_array = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2GRAY)
+        image_array = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
 
         # Apply bilateral filter for smoothing while preserving edges
         filtered = cv2.bilateralFilter(image_array, 9, 75, 75)
@@ -42,7 +100,11 @@ class SemanticMasker:
 
         # Fill contours
         contours, _ = cv2.findContours(dilated, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-        mask = np.zeros_like(dilated)
+        if out is not None and out.shape == dilated.shape and out.dtype == dilated.dtype:
+            mask = out
+            mask.fill(0)
+        else:
+            mask = np.zeros_like(dilated)
 
         if contours:
             cv2.drawContours(mask, contours, -1, 255, -1)
@@ -52,62 +114,61 @@ class SemanticMasker:
 
     @staticmethod
     def create_garment_region_mask(
-        image: Image.Image, garment_type: str, position: str = "center"
+        image: Union[Image.Image, np.ndarray],
+        garment_type: str,
+        position: str = "center",
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         """
         Create a mask for specific garment placement regions.
 
         Args:
-            image: PIL Image object
+            image: PIL Image or numpy array (only its size is used)
             garment_type: Type of clothing (shirt, hat, shoes, etc.)
             position: Garment position on body
+            out: Optional buffer to write the mask into, reused if its shape matches
 
         Returns:
             Binary mask for garment region
         """
-        height, width = np.array(image).shape[:2]
-        mask = np.zeros((height, width), dtype=np.uint8)
-
-        # Define regions for different garment types
-        garment_regions = {
-            "hat": (0, 0, width, int(height * 0.15)),
-            "glasses": (int(width * 0.25), int(height * 0.15), int(width * 0.75), int(height * 0.25)),
-            "shirt": (0, int(height * 0.15), width, int(height * 0.6)),
-            "t-shirt": (0, int(height * 0.15), width, int(height * 0.5)),
-            "blouse": (0, int(height * 0.15), width, int(height * 0.55)),
-            "dress": (0, int(height * 0.15), width, int(height * 0.85)),
-            "jacket": (0, int(height * 0.15), width, int(height * 0.65)),
-            "pants": (0, int(height * 0.45), width, int(height * 0.9)),
-            "jeans": (0, int(height * 0.45), width, int(height * 0.9)),
-            "skirt": (0, int(height * 0.4), width, int(height * 0.75)),
-            "shoes": (0, int(height * 0.85), width, height),
-            "scarf": (int(width * 0.2), int(height * 0.2), int(width * 0.8), int(height * 0.35)),
-        }
-
-        # Get region for garment type
-        region = garment_regions.get(garment_type.lower(), (0, 0, width, height))
-        x1, y1, x2, y2 = region
+        if isinstance(image, np.ndarray):
+            height, width = image.shape[:2]
+        else:
+            width, height = image.size
+        template = _build_garment_mask(garment_type.lower(), height, width)
+        if out is not None and out.shape == template.shape and out.dtype == template.dtype:
+            np.copyto(out, template)
+            mask = out
+        else:
+            mask = template.copy()
 
-        # Draw mask region
-        cv2.rectangle(mask, (x1, y1), (x2, y2), 255, -1)
+        logger.debug(f"Garment region mask created for {garment_type}")
+        return mask
 
-        # Apply dilation for smoothing
-        kernel = cv2.getStructuringElement(
-            cv2.MORPH_ELLIPSE, (config.MASK_DILATION_KERNEL, config.MASK_DILATION_KERNEL)
-        )
-        mask = cv2.dilate(mask, kernel, iterations=1)
+    @staticmethod
+    def precompute_masks(size: Tuple[int, int] = config.MAX_IMAGE_SIZE):
+        """
+        Build and cache region masks for every configured garment type.
 
-        # Apply Gaussian blur for smooth edges
-        mask = cv2.GaussianBlur(mask, config.MASK_BLUR_SIZE, 0)
+        Only images of exactly this size hit the precomputed entries; other
+        sizes still build their mask on first use.
 
-        logger.debug(f"Garment region mask created for {garment_type}")
-        return mask
+        Args:
+            size: Image (width, height) to precompute for
+        """
+        width, height = size
+        for garment_type in config.GARMENT_TYPES:
+            _build_garment_mask(garment_type, height, width)
+        logger.debug(f"Precomputed garment masks for {width}x{height}")
 
     @staticmethod
     def refine_mask(mask: np.ndarray, iterations: int = 2) -> np.ndarray:
         """
         Refine mask using morphological operations.
 
+        A closing and an opening with a kernel grown to match `iterations`
+        passes of a 5x5 ellipse fill holes and remove specks in two passes.
+
         Args:
             mask: Binary mask
             iterations: Number of refinement iterations
@@ -115,15 +176,14 @@ class SemanticMasker:
         Returns:
             Refined mask
         """
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+        size = 4 * iterations + 1
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (size, size))
 
         # Morphological closing (fill holes)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=iterations)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
 
         # Morphological opening (remove noise)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=iterations)
-
-        return mask
+        return cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
 
     @staticmethod
     def blend_masks(mask1: np.ndarray, mask2: np.ndarray, alpha: float = 0.5) -> np.ndarray:
@@ -143,30 +203,29 @@ class SemanticMasker:
 
     @staticmethod
     def apply_mask_to_image(
-        image: Image.Image, mask: np.ndarray, blend_alpha: float = 0.7
+        image: Union[Image.Image, np.ndarray], mask: np.ndarray, blend_alpha: float = 0.7
     ) -> Image.Image:
         """
         Apply mask to image for visualization.
 
         Args:
-            image: PIL Image object
+            image: PIL Image or RGB uint8 numpy array
             mask: Binary mask
             blend_alpha: Alpha blending factor
 
         Returns:
             Masked image as PIL Image
         """
-        image_array = np.array(image)
-        mask_normalized = mask / 255.0
+        image_array = np.asarray(image)
 
         # Create a purple overlay for masked region
         overlay = image_array.copy()
         overlay[mask > 127] = [200, 100, 200]  # Purple color
 
-        # Blend
-        result = (image_array * (1 - blend_alpha) + overlay * blend_alpha).astype(np.uint8)
+        # Blend in place into the overlay buffer
+        cv2.addWeighted(image_array, 1 - blend_alpha, overlay, blend_alpha, 0, dst=overlay)
 
-        return Image.fromarray(result)
+        return Image.fromarray(overlay)
 
     @staticmethod
     def get_mask_statistics(mask: np.ndarray) -> dict:
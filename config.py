@@ -7,6 +7,9 @@ from typing import Literal
 CLIP_MODEL_NAME = "openai/clip-vit-large-patch14"
 STABLE_DIFFUSION_MODEL_ID = "runwayml/stable-diffusion-inpainting"
 DEVICE = "cuda" if os.environ.get("USE_GPU", "true").lower() == "true" else "cpu"
+DTYPE = os.environ.get("DTYPE", "fp16")  # CUDA precision: fp16, bf16 or fp32 (CPU is always fp32)
+if DTYPE not in ("fp16", "bf16", "fp32"):
+    raise ValueError(f"DTYPE must be one of fp16, bf16 or fp32, got {DTYPE!r}")
 
 # Image Processing
 MAX_IMAGE_SIZE = (768, 1024)  # (width, height)
@@ -14,10 +17,24 @@ MIN_IMAGE_SIZE = (256, 256)
 IMAGE_QUALITY = 95
 
 # Inference Configuration
-INFERENCE_STEPS = 50
+INFERENCE_STEPS = 15
 GUIDANCE_SCALE = 7.5
-NUM_INFERENCE_STEPS = 50
+NUM_INFERENCE_STEPS = 15  # Tuned for DPM-Solver++; use ~50 with USE_DPM_SOLVER = False
+USE_DPM_SOLVER = True
+WARMUP = True  # Run a dummy inference when the pipeline is created
+WARMUP_STEPS = 2
 SEED = 42
+MAX_BATCH_SIZE = 4  # Images per batched inpainting call; bound by VRAM
+BATCH_TIMEOUT_MS = 20  # How long concurrent requests wait to share a batch
+ENABLE_ATTENTION_SLICING = False  # Lower VRAM usage at the cost of speed
+COMPILE_UNET = True  # torch.compile the UNet on CUDA (torch>=2.1)
+QUANTIZE = os.environ.get("QUANTIZE", "false").lower() == "true"  # 4-bit NF4 UNet weights
+CUDA_CACHE_RELEASE_THRESHOLD_MB = 1024  # Idle CUDA cache kept by clear_cache
+
+# Result Caching
+CLASSIFICATION_CACHE_SIZE = 256
+RESULT_CACHE_SIZE = 32
+RESULT_DISK_CACHE_SIZE = 512  # Gradio try-on results kept under MODEL_CACHE_DIR/results
 
 # Clothing Classification
 GARMENT_TYPES = [
@@ -44,18 +61,30 @@ GARMENT_TYPES = [
 # API Configuration
 API_HOST = "0.0.0.0"
 API_PORT = 8000
-API_RELOAD = True
+API_RELOAD = os.environ.get("DEV", "false").lower() == "true"  # Auto-reload, development only
 API_LOG_LEVEL = "info"
+API_THREADPOOL_SIZE = 64  # Worker threads for blocking route handlers
+PRELOAD_MODEL = os.environ.get("PRELOAD_MODEL", "true").lower() == "true"
 
 # Gradio Configuration
 GRADIO_HOST = "0.0.0.0"
 GRADIO_PORT = 7860
 GRADIO_SHARE = False
 GRADIO_THEME = "default"
+PREPROCESS_WORKERS = 2 * MAX_BATCH_SIZE  # Person + garment decode for each concurrent try-on
 
 # Model Cache
 MODEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "virtual_tryon_ai")
 os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+RESULT_CACHE_DIR = os.path.join(MODEL_CACHE_DIR, "results")
+
+# Model Server (python -m backend.model_server)
+USE_MODEL_SERVER = os.environ.get("USE_MODEL_SERVER", "false").lower() == "true"  # Gradio app
+MODEL_SERVER_ADDRESS = os.environ.get(
+    "MODEL_SERVER_ADDRESS", os.path.join(MODEL_CACHE_DIR, "model_server.sock")
+)
+MODEL_SERVER_AUTHKEY = os.environ.get("MODEL_SERVER_AUTHKEY")  # Else read/created in key file
+MODEL_SERVER_AUTHKEY_FILE = os.path.join(MODEL_CACHE_DIR, "model_server.key")  # Mode 0600
 
 # Semantic Masking
 MASK_DILATION_KERNEL = 15
@@ -1,13 +1,17 @@
 """Gradio interface for Virtual Try-On AI."""
 
+import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
 
 import gradio as gr
-import numpy as np
 from PIL import Image
 
+from backend.model_server import connect_pipeline
+from backend.utils.cache import DiskCache, content_key
 from backend.utils.inference import get_pipeline
 from backend.utils.image_processor import ImageProcessor
 
@@ -21,22 +25,55 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Initialize components
-pipeline = get_pipeline()
+# Share a running model server's pipeline instead of loading a copy per process
+pipeline = connect_pipeline() if config.USE_MODEL_SERVER else get_pipeline()
 processor = ImageProcessor()
+# Resizes each request's person and garment images in parallel; sized so every
+# concurrent try-on (up to config.MAX_BATCH_SIZE) gets two workers
+preprocess_executor = ThreadPoolExecutor(
+    max_workers=config.PREPROCESS_WORKERS, thread_name_prefix="preprocess"
+)
+# Finished try-ons as JPEGs, with the detection metadata in the JPEG comment
+result_cache = DiskCache(config.RESULT_CACHE_DIR, config.RESULT_DISK_CACHE_SIZE, suffix=".jpg")
+
+
+def preprocess_image(image: Image.Image) -> Image.Image:
+    """
+    Resize a Gradio upload for inference.
+
+    Args:
+        image: Uploaded PIL Image (already EXIF-rotated by Gradio)
+
+    Returns:
+        Resized RGB PIL Image
+    """
+    return processor.resize_image(image.convert("RGB"))
+
+
+def format_try_on_status(result: dict) -> str:
+    """Format the status text shown next to a try-on result."""
+    return (
+        f"✅ Try-on completed!\n\n"
+        f"**Garment detected:** {result['garment_detected']}\n"
+        f"**Confidence:** {result['confidence']:.1%}\n"
+        f"**Processing time:** {result['processing_time']:.2f}s"
+    )
 
 
 def process_try_on(
-    person_image: np.ndarray,
-    garment_image: np.ndarray,
+    person_image: Image.Image,
+    garment_image: Image.Image,
     garment_type: str,
+    num_inference_steps: int = config.NUM_INFERENCE_STEPS,
 ) -> tuple:
     """
     Process virtual try-on request.
 
     Args:
-        person_image: Person image as numpy array
-        garment_image: Garment image as numpy array
+        person_image: PIL Image of the person
+        garment_image: PIL Image of the garment
         garment_type: Selected or custom garment type
+        num_inference_steps: Number of diffusion steps
 
     Returns:
         Tuple of (result_image, status_text)
@@ -45,38 +82,52 @@ def process_try_on(
         if person_image is None or garment_image is None:
             return None, "❌ Please upload both person and garment images"
 
-        # Convert to PIL Images
-        person_pil = Image.fromarray(person_image.astype("uint8"), "RGB")
-        garment_pil = Image.fromarray(garment_image.astype("uint8"), "RGB")
+        # Resize both images in parallel
+        start_time = time.time()
+        person_future = preprocess_executor.submit(preprocess_image, person_image)
+        garment_future = preprocess_executor.submit(preprocess_image, garment_image)
+        person_pil = person_future.result()
+        garment_pil = garment_future.result()
+
+        # Repeated uploads are looked up by resized content before any inference
+        cache_key = content_key(person_pil, garment_pil, garment_type, int(num_inference_steps))
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            result_image = Image.open(BytesIO(cached))
+            result = json.loads(result_image.info["comment"])
+            result["processing_time"] = time.time() - start_time
+            logger.info("Try-on served from disk cache")
+            return result_image, format_try_on_status(result)
 
         # Process
         logger.info(f"Processing try-on with garment type: {garment_type}")
-        result = pipeline.generate_try_on(
+        result = pipeline.generate_try_on_batched(
             person_image=person_pil,
             garment_image=garment_pil,
             garment_type=garment_type if garment_type != "Auto-detect" else None,
+            num_inference_steps=int(num_inference_steps),
         )
 
-        status = (
-            f"✅ Try-on completed!\n\n"
-            f"**Garment detected:** {result['garment_detected']}\n"
-            f"**Confidence:** {result['confidence']:.1%}\n"
-            f"**Processing time:** {result['processing_time']:.2f}s"
+        metadata = {key: result[key] for key in ("garment_detected", "confidence")}
+        buffer = BytesIO()
+        result["result_image"].save(
+            buffer, format="JPEG", quality=config.IMAGE_QUALITY, comment=json.dumps(metadata)
         )
+        result_cache.put(cache_key, buffer.getvalue())
 
-        return result["result_image"], status
+        return result["result_image"], format_try_on_status(result)
 
     except Exception as e:
         logger.error(f"Error processing try-on: {e}")
         return None, f"❌ Error: {str(e)}"
 
 
-def classify_garment_ui(garment_image: np.ndarray) -> str:
+def classify_garment_ui(garment_image: Image.Image) -> str:
     """
     Classify garment type from image.
 
     Args:
-        garment_image: Garment image as numpy array
+        garment_image: PIL Image of the garment
 
     Returns:
         Classification result text
@@ -85,7 +136,7 @@ def classify_garment_ui(garment_image: np.ndarray) -> str:
         if garment_image is None:
             return "❌ Please upload a garment image"
 
-        garment_pil = Image.fromarray(garment_image.astype("uint8"), "RGB")
+        garment_pil = preprocess_image(garment_image)
         result = pipeline.classify_garment(garment_pil)
 
         classification_text = (
@@ -122,7 +173,7 @@ def create_interface():
                         gr.Markdown("### Person Image")
                         person_input = gr.Image(
                             label="Upload your photo",
-                            type="numpy",
+                            type="pil",
                             sources=["upload", "webcam"],
                         )
 
@@ -130,7 +181,7 @@ def create_interface():
                         gr.Markdown("### Garment Image")
                         garment_input = gr.Image(
                             label="Upload garment photo",
-                            type="numpy",
+                            type="pil",
                             sources=["upload"],
                         )
 
@@ -142,6 +193,14 @@ def create_interface():
                             label="Garment Type",
                             info="Select or auto-detect the garment type",
                         )
+                        steps_input = gr.Slider(
+                            minimum=10,
+                            maximum=50,
+                            step=1,
+                            value=config.NUM_INFERENCE_STEPS,
+                            label="Inference Steps",
+                            info="Fewer steps are faster; more steps add detail",
+                        )
 
                     with gr.Column(scale=1):
                         tryon_button = gr.Button(
@@ -160,10 +219,12 @@ def create_interface():
                     with gr.Column():
                         status_output = gr.Markdown("Waiting for input...")
 
+                # Let concurrent clicks reach the pipeline together so they can be batched
                 tryon_button.click(
                     fn=process_try_on,
-                    inputs=[person_input, garment_input, garment_type_input],
+                    inputs=[person_input, garment_input, garment_type_input, steps_input],
                     outputs=[result_image, status_output],
+                    concurrency_limit=config.MAX_BATCH_SIZE,
                 )
 
             # Classification Tab
@@ -177,7 +238,7 @@ def create_interface():
                     with gr.Column():
                         classify_input = gr.Image(
                             label="Upload garment image",
-                            type="numpy",
+                            type="pil",
                             sources=["upload"],
                         )
 
@@ -32,6 +32,20 @@ def run_command(command: list, description: str) -> bool:
         return False
 
 
+# Fetches the weights loaded by the app into its cache; runs in the venv's Python
+DOWNLOAD_SCRIPT = """
+import config
+from huggingface_hub import snapshot_download
+
+for repo_id in (config.CLIP_MODEL_NAME, config.STABLE_DIFFUSION_MODEL_ID):
+    snapshot_download(
+        repo_id,
+        cache_dir=config.MODEL_CACHE_DIR,
+        allow_patterns=["*.json", "*.txt", "*.safetensors"],
+    )
+"""
+
+
 def main():
     """Run the quick start sequence."""
     print("""
@@ -63,15 +77,11 @@ def main():
 
     print(f"\n💡 Activate environment with: source {activate_cmd}")
 
-    # Install requirements
-    pip_cmd = str(venv_path / ("Scripts" if sys.platform == "win32" else "bin") / "pip")
-    if run_command([pip_cmd, "install", "-r", "requirements.txt"], "Installing dependencies"):
-        print("✅ Dependencies installed")
-    else:
-        print("❌ Failed to install dependencies")
-        sys.exit(1)
+    bin_dir = venv_path / ("Scripts" if sys.platform == "win32" else "bin")
+    pip_cmd = str(bin_dir / "pip")
+    python_cmd = str(bin_dir / "python")
 
-    # Download models
+    # Ask about models up front so the download can overlap dependency installation
     print("""
     ╔══════════════════════════════════════════════════════════╗
     ║  📥 Downloading Pre-trained Models (Optional)            ║
@@ -81,12 +91,32 @@ def main():
         "Do you want to download pre-trained models now? (y/n, ~6GB required): "
     ).lower()
 
+    download = None
+    if response == "y" and run_command(
+        [pip_cmd, "install", "--prefer-binary", "huggingface_hub>=0.19.3,<1.0", "hf_transfer"],
+        "Installing model downloader",
+    ):
+        print("📥 Downloading ML models in the background...")
+        # hf_transfer fetches each file over several parallel connections
+        download = subprocess.Popen(
+            [python_cmd, "-c", DOWNLOAD_SCRIPT],
+            env={**os.environ, "HF_HUB_ENABLE_HF_TRANSFER": "1"},
+        )
+
+    # Install requirements (wheels preferred over source builds)
+    if run_command(
+        [pip_cmd, "install", "--prefer-binary", "-r", "requirements.txt"],
+        "Installing dependencies",
+    ):
+        print("✅ Dependencies installed")
+    else:
+        print("❌ Failed to install dependencies")
+        if download is not None:
+            download.terminate()
+        sys.exit(1)
+
     if response == "y":
-        python_cmd = str(venv_path / ("Scripts" if sys.platform == "win32" else "bin") / "python")
-        if run_command(
-            [python_cmd, "backend/models/download_models.py"],
-            "Downloading ML models",
-        ):
+        if download is not None and download.wait() == 0:
             print("✅ Models downloaded successfully")
         else:
             print("⚠️  Some models might be downloaded on first run")
@@ -30,7 +30,9 @@ setup(
         "torchvision>=0.15.0",
         "transformers>=4.30.0",
         "diffusers>=0.20.0",
+        "accelerate>=0.20.0",
         "pillow>=10.0.0",
+        "pybase64>=1.3.0",
         "opencv-python>=4.8.0",
         "numpy>=1.24.0",
         "fastapi>=0.100.0",
@@ -45,6 +47,10 @@ setup(
             "flake8>=6.0",
             "mypy>=1.0",
         ],
+        "quantization": [
+            "bitsandbytes>=0.43.0",
+            "diffusers>=0.31.0",
+        ],
     },
     entry_points={
         "console_scripts": [
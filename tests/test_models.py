@@ -1,11 +1,22 @@
 """Unit tests for Virtual Try-On AI."""
 
+import os
+import signal
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
 from PIL import Image
 import numpy as np
 
+import config
+
 from backend.models import ClothingClassifier
+from backend.utils.batcher import DynamicBatcher
+from backend.utils.cache import DiskCache, LRUCache, content_key
 from backend.utils.image_processor import ImageProcessor
+from backend.utils.inference import InferencePipeline
 from backend.utils.masking import SemanticMasker
 
 
@@ -18,6 +29,14 @@ class TestImageProcessor(unittest.TestCase):
         # Create a dummy image
         self.test_image = Image.new("RGB", (512, 512), color="red")
 
+    def test_resize_image(self):
+        """Test downscaling keeps aspect ratio and skips small images."""
+        large = Image.new("RGB", (2000, 1000), color="red")
+        resized = self.processor.resize_image(large, max_size=(768, 1024))
+        self.assertEqual(resized.size, (768, 384))
+        self.assertEqual(resized.mode, "RGB")
+        self.assertIs(self.processor.resize_image(self.test_image), self.test_image)
+
     def test_normalize_image(self):
         """Test image normalization."""
         normalized = self.processor.normalize_image(self.test_image)
@@ -25,18 +44,40 @@ class TestImageProcessor(unittest.TestCase):
         self.assertTrue(np.all(normalized <= 1.0))
         self.assertTrue(np.all(normalized >= 0.0))
 
+    def test_normalize_image_channels_first(self):
+        """Test planar normalization matches the interleaved layout."""
+        planar = self.processor.normalize_image(self.test_image, channels_first=True)
+        interleaved = self.processor.normalize_image(self.test_image)
+        self.assertEqual(planar.shape, (3, 512, 512))
+        self.assertEqual(planar.dtype, np.float32)
+        self.assertTrue(np.array_equal(planar, interleaved.transpose(2, 0, 1)))
+
     def test_denormalize_image(self):
         """Test image denormalization."""
         normalized = self.processor.normalize_image(self.test_image)
         denormalized = self.processor.denormalize_image(normalized, format="PIL")
         self.assertIsInstance(denormalized, Image.Image)
 
+    def test_denormalize_image_round_trip(self):
+        """Test normalize/denormalize restores the original pixels."""
+        normalized = self.processor.normalize_image(self.test_image)
+        out = np.empty((512, 512, 3), dtype=np.uint8)
+        restored = self.processor.denormalize_image(normalized, format="numpy", out=out)
+        self.assertIs(restored, out)
+        self.assertTrue(np.array_equal(restored, np.asarray(self.test_image)))
+
     def test_image_to_base64_and_back(self):
         """Test base64 conversion."""
         base64_str = self.processor.image_to_base64(self.test_image)
         recovered_image = self.processor.base64_to_image(base64_str)
         self.assertEqual(recovered_image.size, self.test_image.size)
 
+    def test_image_to_base64_lossless(self):
+        """Test PNG encoding keeps pixels intact."""
+        base64_str = self.processor.image_to_base64(self.test_image, format="PNG")
+        recovered_image = self.processor.base64_to_image(base64_str)
+        self.assertEqual(recovered_image.tobytes(), self.test_image.tobytes())
+
 
 class TestSemanticMasker(unittest.TestCase):
     """Tests for SemanticMasker."""
@@ -57,12 +98,47 @@ class TestSemanticMasker(unittest.TestCase):
             self.assertEqual(mask.shape, (512, 512))
             self.assertTrue(np.max(mask) > 0)  # Has masked region
 
+    def test_create_garment_region_mask_from_array(self):
+        """Test masks built from arrays match masks built from images."""
+        from_image = self.masker.create_garment_region_mask(self.test_image, "shirt")
+        from_array = self.masker.create_garment_region_mask(np.asarray(self.test_image), "shirt")
+        self.assertTrue(np.array_equal(from_image, from_array))
+
+    def test_create_garment_region_mask_into_buffer(self):
+        """Test masks are written into a matching output buffer."""
+        out = np.empty((512, 512), dtype=np.uint8)
+        mask = self.masker.create_garment_region_mask(self.test_image, "hat", out=out)
+        self.assertIs(mask, out)
+        self.assertTrue(
+            np.array_equal(mask, self.masker.create_garment_region_mask(self.test_image, "hat"))
+        )
+
     def test_refine_mask(self):
         """Test mask refinement."""
         mask = self.masker.create_garment_region_mask(self.test_image, "shirt")
         refined = self.masker.refine_mask(mask)
         self.assertEqual(refined.shape, mask.shape)
 
+    def test_refine_mask_removes_specks_and_fills_holes(self):
+        """Test refinement drops isolated specks and fills small holes."""
+        mask = np.zeros((200, 200), dtype=np.uint8)
+        mask[20:23, 20:23] = 255
+        mask[80:180, 80:180] = 255
+        mask[128:131, 128:131] = 0
+        refined = self.masker.refine_mask(mask)
+        self.assertEqual(refined[21, 21], 0)
+        self.assertEqual(refined[129, 129], 255)
+        self.assertEqual(refined[100, 100], 255)
+
+    def test_apply_mask_to_image(self):
+        """Test mask overlay only tints the masked region."""
+        mask = np.zeros((512, 512), dtype=np.uint8)
+        mask[:256] = 255
+        result = np.asarray(self.masker.apply_mask_to_image(self.test_image, mask))
+        self.assertEqual(result.shape, (512, 512, 3))
+        self.assertTrue(np.array_equal(result[300, 300], [0, 0, 255]))
+        self.assertFalse(np.array_equal(result[100, 100], [0, 0, 255]))
+
     def test_get_mask_statistics(self):
         """Test mask statistics calculation."""
         mask = self.masker.create_garment_region_mask(self.test_image, "shirt")
@@ -74,6 +150,131 @@ class TestSemanticMasker(unittest.TestCase):
         self.assertGreater(stats["coverage_percentage"], 0)
 
 
+class TestLRUCache(unittest.TestCase):
+    """Tests for LRUCache and content_key."""
+
+    def test_content_key(self):
+        """Test keys depend on image content and parameters."""
+        red = Image.new("RGB", (64, 64), color="red")
+        blue = Image.new("RGB", (64, 64), color="blue")
+        self.assertEqual(content_key(red, "shirt"), content_key(red.copy(), "shirt"))
+        self.assertNotEqual(content_key(red, "shirt"), content_key(blue, "shirt"))
+        self.assertNotEqual(content_key(red, "shirt"), content_key(red, "hat"))
+        self.assertNotEqual(content_key(None), content_key("None"))
+        self.assertNotEqual(content_key(15), content_key("15"))
+        self.assertNotEqual(content_key(b"a\x00", b"b"), content_key(b"a", b"\x00b"))
+
+    def test_eviction(self):
+        """Test least recently used entries are evicted first."""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+
+class TestDiskCache(unittest.TestCase):
+    """Tests for DiskCache."""
+
+    def test_eviction(self):
+        """Test entries persist on disk and the least recently used is evicted."""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = DiskCache(directory, maxsize=2, suffix=".jpg")
+            cache.put(b"a", b"1")
+            cache.put(b"b", b"2")
+            cache.get(b"a")
+            cache.put(b"c", b"3")
+            reopened = DiskCache(directory, maxsize=2, suffix=".jpg")
+            self.assertEqual(reopened.get(b"a"), b"1")
+            self.assertIsNone(reopened.get(b"b"))
+            self.assertEqual(len(reopened), 2)
+
+
+class TestDynamicBatcher(unittest.TestCase):
+    """Tests for DynamicBatcher."""
+
+    def test_concurrent_calls_are_batched(self):
+        """Test queued items are processed together and results routed back."""
+        batch_sizes = []
+
+        def double(items):
+            batch_sizes.append(len(items))
+            return [item * 2 for item in items]
+
+        batcher = DynamicBatcher(double, max_batch_size=4, timeout_ms=200)
+        futures = [batcher.submit(i) for i in range(4)]
+        self.assertEqual([f.result(timeout=5) for f in futures], [0, 2, 4, 6])
+        self.assertEqual(sum(batch_sizes), 4)
+        self.assertLess(len(batch_sizes), 4)
+
+    def test_errors_propagate(self):
+        """Test batch failures are raised to every caller."""
+
+        def fail(items):
+            raise ValueError("boom")
+
+        batcher = DynamicBatcher(fail, max_batch_size=2, timeout_ms=10)
+        with self.assertRaises(ValueError):
+            batcher(1)
+
+
+class TestInferencePipeline(unittest.TestCase):
+    """Tests for InferencePipeline batching, with the models stubbed out."""
+
+    def setUp(self):
+        """Set up a pipeline around a fake diffusers pipeline."""
+        self.batch_sizes = []
+
+        def inpaint(prompt, image, mask_image, **kwargs):
+            self.batch_sizes.append(len(image))
+            return SimpleNamespace(images=[Image.new("RGB", (512, 512)) for _ in image])
+
+        with mock.patch("backend.utils.inference.ClothingClassifier"), mock.patch(
+            "backend.utils.inference.load_inpaint_pipeline",
+            return_value=mock.Mock(side_effect=inpaint),
+        ), mock.patch.object(config, "BATCH_TIMEOUT_MS", 200):
+            self.pipeline = InferencePipeline(device="cpu")
+
+    def test_different_sizes_share_a_batch(self):
+        """Test concurrent requests with different image sizes make one pipeline call."""
+        garment = Image.new("RGB", (64, 64), color="green")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(
+                    self.pipeline.generate_try_on_batched,
+                    Image.new("RGB", (width, 800)),
+                    garment,
+                    "shirt",
+                )
+                for width in (500, 510, 520, 530)
+            ]
+            results = [future.result(timeout=5) for future in futures]
+        self.assertEqual(self.batch_sizes, [4])
+        self.assertTrue(all(result["garment_detected"] == "shirt" for result in results))
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_try_on_after_fork(self):
+        """Test a process forked after warmup (gunicorn --preload) can still run try-ons."""
+        self.pipeline.warmup()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                signal.alarm(10)
+                result = self.pipeline.generate_try_on(
+                    Image.new("RGB", (512, 512)), Image.new("RGB", (64, 64)), "shirt"
+                )
+                exit_code = 0 if result["garment_detected"] == "shirt" else 1
+            finally:
+                os._exit(exit_code)
+
+        _, status = os.waitpid(pid, 0)
+        self.assertTrue(os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0)
+
+
 class TestClothingClassifier(unittest.TestCase):
     """Tests for ClothingClassifier."""
 